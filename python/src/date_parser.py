@@ -0,0 +1,167 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Year-first formats that pandas always reads the same way, whatever the other
+# values in the column look like. Only these may be used as a per-column
+# shortcut: for day/month orders such as '%d/%m/%Y' the guess depends on which
+# cell was seen first, and caching that reading would make results order-dependent.
+UNAMBIGUOUS_FORMATS = {
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y/%m/%d',
+    '%Y/%m/%d %H:%M:%S',
+}
+
+# Marks a cached string that could not be parsed, so failures are memoized too
+_UNPARSEABLE = object()
+
+class DateColumn:
+    """
+    Parsing state for one column of date cells.
+
+    The format is inferred from the first value that parses and, if it is one
+    of the UNAMBIGUOUS_FORMATS, tried first for every other value in the column.
+    """
+    def __init__(self):
+        self.format = None
+        self.inferred = False
+
+class DateParser:
+    """
+    Memoized parser for the session-date strings found in workbook date columns.
+
+    Results are kept in a bounded LRU keyed by the stripped string, so the
+    same date column repeated across student sheets and files is only parsed
+    once. Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.format_hits = 0
+
+    def column(self) -> DateColumn:
+        """Start a new column whose format will be inferred on first use."""
+        return DateColumn()
+
+    def parse(self, value: Any, column: Optional[DateColumn] = None) -> Optional[datetime]:
+        """
+        Parse a cell value into a datetime.
+
+        Args:
+            value: Cell value; datetimes are returned as-is, strings are memoized
+            column: Optional column state used to reuse the inferred format
+
+        Returns:
+            The parsed datetime, or None if the value is not a date
+        """
+        if isinstance(value, datetime):
+            return value
+        if not isinstance(value, str):
+            return self._parse_text(value)
+
+        text = value.strip()
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return None if cached is _UNPARSEABLE else cached
+            self.misses += 1
+
+        result = None
+        if column is not None and column.format:
+            try:
+                result = datetime.strptime(text, column.format)
+                with self._lock:
+                    self.format_hits += 1
+            except ValueError:
+                result = None
+
+        if result is None:
+            result = self._parse_text(text)
+            if column is not None and not column.inferred and result is not None:
+                guessed = guess_datetime_format(text)
+                column.format = guessed if guessed in UNAMBIGUOUS_FORMATS else None
+                column.inferred = True
+
+        with self._lock:
+            self._cache[text] = _UNPARSEABLE if result is None else result
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def _parse_text(self, value: Any) -> Optional[datetime]:
+        """Parse with pandas, falling back to the DD-MM-YY format."""
+        try:
+            return self._to_datetime(pd.to_datetime(value))
+        except (ValueError, TypeError, OverflowError):
+            pass
+
+        try:
+            # Handle DD-MM-YY format
+            date_parts = str(value).split('-')
+            if len(date_parts) == 3:
+                return self._to_datetime(pd.to_datetime(f"20{date_parts[2]}-{date_parts[1]}-{date_parts[0]}"))
+        except (ValueError, TypeError, OverflowError):
+            pass
+        return None
+
+    @staticmethod
+    def _to_datetime(timestamp) -> Optional[datetime]:
+        """Convert a pandas result to a plain datetime, treating NaT as missing."""
+        if pd.isna(timestamp):
+            return None
+        return timestamp.to_pydatetime()
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Return cache statistics, including the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'format_hits': self.format_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'currsize': len(self._cache),
+                'maxsize': self.maxsize
+            }
+
+    def cache_clear(self):
+        """Drop all cached results and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.format_hits = 0
+
+# Shared by every caller in the process so sheets and files reuse each other's work
+default_parser = DateParser()
+
+def parse_date(value: Any, column: Optional[DateColumn] = None) -> Optional[datetime]:
+    """Parse a cell value with the shared parser."""
+    return default_parser.parse(value, column)
+
+def new_column() -> DateColumn:
+    """Start a new column on the shared parser."""
+    return default_parser.column()
+
+def cache_info() -> Dict[str, Any]:
+    """Return statistics for the shared parser's cache."""
+    return default_parser.cache_info()
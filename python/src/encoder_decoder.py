@@ -2,7 +2,13 @@ import base64
 import json
 from urllib.parse import unquote
 import zlib
-from typing import Dict, Optional, Union, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Union, Any, Tuple
+
+SEPARATOR = '---'
+
+# Header keys written by the web exporter; a header may have an empty value
+HEADER_KEYS = ('فصل', 'التاريخ', 'اختبار')
 
 def extract_header_and_data(encoded_string: str) -> Tuple[Dict[str, str], str]:
     """
@@ -33,6 +39,42 @@ def extract_header_and_data(encoded_string: str) -> Tuple[Dict[str, str], str]:
     # If no header found, return empty header and the full string as data
     return header_info, encoded_string.strip()
 
+def _decode(compressed: str) -> Optional[Union[Dict[str, Any], str]]:
+    """
+    Decodes a compressed string, raising on malformed input.
+    
+    Shared by decode_data and decode_many so the latter can report why
+    an individual report failed.
+    """
+    if not compressed or not isinstance(compressed, str):
+        return None
+
+    # Drop line breaks from wrapped payloads so they don't skew the padding
+    compressed = ''.join(compressed.split())
+    
+    # URL decode first, matching JS decodeURIComponent
+    url_decoded = unquote(compressed)
+    
+    # Restore base64 padding and characters, matching JS version
+    base64_str = url_decoded.replace('-', '+').replace('_', '/')
+    while len(base64_str) % 4:
+        base64_str += '='
+        
+    # Decode base64
+    binary_data = base64.b64decode(base64_str)
+    
+    # Decompress using zlib (equivalent to pako.inflate)
+    decompressed_data = zlib.decompress(binary_data, wbits=15)
+    
+    # Decode to UTF-8 string
+    text = decompressed_data.decode('utf-8')
+    
+    # Try to parse as JSON
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
 def decode_data(compressed: str) -> Optional[Dict[str, Any]]:
     """
     Decodes a compressed string using the same algorithm as the JS version.
@@ -44,35 +86,90 @@ def decode_data(compressed: str) -> Optional[Dict[str, Any]]:
         The decoded data structure, or None if decoding fails
     """
     try:
-        if not compressed or not isinstance(compressed, str):
-            return None
+        return _decode(compressed)
+    except Exception as e:
+        print('Decompression error:', str(e))
+        return None
 
-        # URL decode first, matching JS decodeURIComponent
-        url_decoded = unquote(compressed)
-        
-        # Restore base64 padding and characters, matching JS version
-        base64_str = url_decoded.replace('-', '+').replace('_', '/')
-        while len(base64_str) % 4:
-            base64_str += '='
-            
-        # Decode base64
-        binary_data = base64.b64decode(base64_str)
+def is_header_line(line: str) -> bool:
+    """Checks whether a stripped line is a report header such as 'فصل: ...'."""
+    key, colon, _ = line.partition(':')
+    return bool(colon) and key.strip() in HEADER_KEYS
+
+def split_reports(source: Union[str, TextIO, Iterable[str]]) -> Iterator[str]:
+    """
+    Splits a paste containing several exported reports into individual reports.
+    
+    Lines are consumed one at a time, so a file object is never read whole.
+    A report ends when a header line (e.g. 'فصل: ...') follows its payload,
+    or when a new payload starts after a blank line. Consecutive payload
+    lines are kept together as one wrapped payload.
+    
+    Args:
+        source: The pasted text, or an open text file / iterable of lines
         
-        # Decompress using zlib (equivalent to pako.inflate)
-        decompressed_data = zlib.decompress(binary_data, wbits=15)
+    Yields:
+        Each report as a string in the format accepted by extract_header_and_data
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    
+    current = []
+    has_payload = False
+    after_blank = False
+    
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            after_blank = True
+            continue
         
-        # Decode to UTF-8 string
-        text = decompressed_data.decode('utf-8')
+        is_header = is_header_line(stripped)
+        starts_new = has_payload and (is_header or (stripped != SEPARATOR and after_blank))
+        if starts_new:
+            yield '\n'.join(current)
+            current = []
+            has_payload = False
         
-        # Try to parse as JSON
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return text
-            
+        current.append(stripped)
+        if not is_header and stripped != SEPARATOR:
+            has_payload = True
+        after_blank = False
+    
+    if current:
+        yield '\n'.join(current)
+
+def _decode_report(report: str) -> Dict[str, Any]:
+    """Decodes one report from split_reports, capturing any error."""
+    header_info, compressed = extract_header_and_data(report)
+    try:
+        data = _decode(compressed)
+        error = None if data is not None else 'Empty report'
     except Exception as e:
-        print('Decompression error:', str(e))
-        return None
+        data = None
+        error = str(e)
+    return {'header': header_info, 'data': data, 'error': error}
+
+def decode_many(
+    source: Union[str, TextIO, Iterable[str]],
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Decodes every report in a multi-report paste or file.
+    
+    Reports are decoded concurrently in a thread pool; zlib releases the GIL
+    while inflating, so large pastes decode in parallel.
+    
+    Args:
+        source: The pasted text, or an open text file / iterable of lines
+        max_workers: Size of the thread pool (defaults to the executor's default)
+        
+    Returns:
+        One dict per report, in input order, with 'header', 'data' and 'error'
+        ('error' is None when the report decoded successfully)
+    """
+    reports = split_reports(source)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_decode_report, reports))
 
 def encode_data(data: Dict[str, Any]) -> str:
     """
@@ -2,6 +2,9 @@ import os
 import pandas as pd
 from datetime import datetime
 import logging
+import date_parser
+from pandas._libs.parsers import STR_NA_VALUES
+from xlsx_reader import XlsxReader
 
 # Set up logging configuration
 logging.basicConfig(
@@ -17,42 +20,40 @@ logging.basicConfig(
 ATTENDANCE_START_DATE = pd.to_datetime('2024-09-01')
 ATTENDANCE_END_DATE = pd.to_datetime('2024-12-31')
 
-def parse_date(date_str):
-    """Helper function to parse date string into pandas datetime"""
-    try:
-        return pd.to_datetime(date_str)
-    except:
-        try:
-            # Handle DD-MM-YY format
-            date_parts = date_str.split('-')
-            if len(date_parts) == 3:
-                return pd.to_datetime(f"20{date_parts[2]}-{date_parts[1]}-{date_parts[0]}")
-        except:
-            pass
-    return None
+# Text of the cell that marks the exam block; sections and scores are the two rows below it
+EXAM_ANCHOR = "امتحان الفصل الدراسى الثانى"
 
-def count_attendance_from_weekly(df):
-    """Count attendance by checking dates within specified range"""
+# Cell texts that read_excel turns into NaN by default, so the XML path drops them too
+NA_TEXTS = frozenset(STR_NA_VALUES)
+
+def parse_date(date_str, column=None):
+    """Helper function to parse date string using the shared memoized date parser"""
+    return date_parser.parse_date(date_str, column)
+
+def count_attendance(rows):
+    """Count attendance from (row index, date cell, status cell) tuples within specified range"""
     attended = 0
     total_sessions = 0
+    date_column = date_parser.new_column()
     
     # Process each row
-    for idx, row in df.iterrows():
-        date_str = str(row.iloc[0]).strip()
-        
-        # Skip empty rows or rows without digits
-        if not date_str or not any(char.isdigit() for char in date_str):
-            continue
+    for idx, date_value, status_value in rows:
+        if not isinstance(date_value, datetime):
+            date_value = str(date_value).strip()
+            
+            # Skip empty rows or rows without digits
+            if not date_value or not any(char.isdigit() for char in date_value):
+                continue
             
         # Parse the date
-        date = parse_date(date_str)
+        date = parse_date(date_value, date_column)
         if date is None:
             continue
             
         # Check if date is within our specified range
         if ATTENDANCE_START_DATE <= date <= ATTENDANCE_END_DATE:
             total_sessions += 1
-            status = str(row.iloc[1]).strip()
+            status = str(status_value).strip()
             
             if status == 'حاضر':
                 attended += 1
@@ -63,6 +64,10 @@ def count_attendance_from_weekly(df):
     logging.info(f"Final count: {attended} present out of {total_sessions} total sessions (between {ATTENDANCE_START_DATE.date()} and {ATTENDANCE_END_DATE.date()})")
     return attended, total_sessions
 
+def count_attendance_from_weekly(df):
+    """Count attendance by checking dates within specified range"""
+    return count_attendance((idx, row.iloc[0], row.iloc[1]) for idx, row in df.iterrows())
+
 def extract_attendance(df, sheet_name):
     """Extract attendance data from the sheet."""
     logging.info(f"\n{'='*50}")
@@ -70,44 +75,111 @@ def extract_attendance(df, sheet_name):
     
     return count_attendance_from_weekly(df)
 
-def extract_exam_scores(file_path):
-    """Extract exam scores and attendance from the Excel file."""
-    logging.info(f"\nProcessing file: {file_path}")
+def read_sheet_scores(file_path, sheet):
+    """
+    Read attendance and exam scores from one sheet with pandas.
     
-    xls = pd.ExcelFile(file_path)
+    Returns (attended, total, exam_sections, scores), or None if the sheet has no exam data.
+    """
+    df = pd.read_excel(file_path, sheet_name=sheet)
+    
+    # Extract attendance first
+    attended, total = extract_attendance(df, sheet)
+    
+    # Rest of the exam processing code
+    exam_row_index = df[df.apply(lambda row: row.astype(str).str.contains(EXAM_ANCHOR, na=False).any(), axis=1)].index
+    
+    if exam_row_index.empty:
+        return None
+    
+    row_idx = exam_row_index[0]
+    
+    section_row = df.iloc[row_idx + 1].dropna()
+    scores_row = df.iloc[row_idx + 2].dropna()
+    
+    # Keep the columns in sheet order
+    valid_columns = [col for col in section_row.index if col in scores_row.index]
+    if not valid_columns:
+        logging.warning(f"No valid exam data found in sheet '{sheet}'")
+        return None
+    
+    exam_sections = section_row.loc[valid_columns].tolist()
+    scores = scores_row.loc[valid_columns].tolist()
+    return attended, total, exam_sections, scores
+
+def iter_sheet_attendance(reader, sheet, exam):
+    """
+    Stream (row index, date cell, status cell) tuples from a sheet, capturing the exam block into `exam`.
+    
+    Row indexes match the pandas path, where row 1 is the header, and text
+    placeholders such as 'NA' are dropped as read_excel would. Session rows
+    can follow the exam block, so the whole sheet is always streamed; only the
+    current row is held in memory.
+    """
+    for row_number, cells in reader.iter_rows(sheet):
+        if row_number == 1:
+            continue
+        
+        cells = {col: value for col, value in cells.items()
+                 if not (isinstance(value, str) and value in NA_TEXTS)}
+        
+        anchor = exam.get('anchor')
+        if anchor is None:
+            if any(isinstance(value, str) and EXAM_ANCHOR in value for value in cells.values()):
+                exam['anchor'] = row_number
+        elif row_number == anchor + 1:
+            exam['sections'] = cells
+        elif row_number == anchor + 2:
+            exam['scores'] = cells
+        
+        yield row_number - 2, cells.get(1), cells.get(2)
+
+def read_sheet_scores_fast(reader, sheet):
+    """
+    Read attendance and exam scores from one sheet by streaming its XML.
+    
+    Returns the same tuple as read_sheet_scores, or None if the sheet has no exam data.
+    """
+    logging.info(f"\n{'='*50}")
+    logging.info(f"Processing attendance for sheet: {sheet}")
+    
+    exam = {}
+    attended, total = count_attendance(iter_sheet_attendance(reader, sheet, exam))
+    
+    if exam.get('anchor') is None:
+        return None
+    
+    section_cells = exam.get('sections', {})
+    score_cells = exam.get('scores', {})
+    
+    valid_columns = [col for col in sorted(section_cells) if col in score_cells]
+    if not valid_columns:
+        logging.warning(f"No valid exam data found in sheet '{sheet}'")
+        return None
+    
+    exam_sections = [section_cells[col] for col in valid_columns]
+    scores = [score_cells[col] for col in valid_columns]
+    return attended, total, exam_sections, scores
+
+def collect_exam_scores(file_path, sheet_names, read_sheet):
+    """Build the scores DataFrame from every student sheet using the given sheet reader."""
     students_scores = {}
     
-    for sheet in xls.sheet_names:
+    for sheet in sheet_names:
         if "Tabelle" not in sheet and "الطالب" not in sheet:
             try:
                 logging.info(f"\nProcessing sheet: {sheet}")
-                df = pd.read_excel(file_path, sheet_name=sheet)
+                result = read_sheet(sheet)
+                if result is None:
+                    continue
                 
-                # Extract attendance first
-                attended, total = extract_attendance(df, sheet)
+                attended, total, exam_sections, scores = result
                 
-                # Rest of the exam processing code
-                exam_row_index = df[df.apply(lambda row: row.astype(str).str.contains("امتحان الفصل الدراسى الثانى", na=False).any(), axis=1)].index
+                # Add attendance as an additional score
+                exam_sections.append('Attendance')
+                scores.append(f"{attended}/{total}" if total > 0 else "0/0")
                 
-                if not exam_row_index.empty:
-                    row_idx = exam_row_index[0]
-                    
-                    section_row = df.iloc[row_idx + 1].dropna()
-                    scores_row = df.iloc[row_idx + 2].dropna()
-                    
-                    valid_columns = list(set(section_row.index) & set(scores_row.index))
-                    if not valid_columns:
-                        logging.warning(f"No valid exam data found in sheet '{sheet}'")
-                        continue
-                    
-                    exam_sections = section_row.loc[valid_columns].tolist()
-                    scores = scores_row.loc[valid_columns].tolist()
-                    
-                    # Add attendance as an additional score
-                    exam_sections.append('Attendance')
-                    scores.append(f"{attended}/{total}" if total > 0 else "0/0")
-                    
-                    students_scores[sheet] = scores
+                students_scores[sheet] = scores
             except Exception as e:
                 logging.error(f"Error processing sheet {sheet}: {str(e)}")
                 continue
@@ -121,22 +193,68 @@ def extract_exam_scores(file_path):
     
     return scores_df
 
-def process_xlsx_files_in_folder(folder_path):
-    """Process all Excel files in the specified folder."""
+def extract_exam_scores(file_path, fast=False):
+    """
+    Extract exam scores and attendance from the Excel file.
+    
+    With fast=True the sheets are streamed from the .xlsx XML instead of being
+    loaded into pandas DataFrames.
+    """
+    logging.info(f"\nProcessing file: {file_path}")
+    
+    if fast:
+        with XlsxReader(file_path) as reader:
+            return collect_exam_scores(file_path, reader.sheet_names,
+                                       lambda sheet: read_sheet_scores_fast(reader, sheet))
+    
+    xls = pd.ExcelFile(file_path)
+    return collect_exam_scores(file_path, xls.sheet_names,
+                               lambda sheet: read_sheet_scores(file_path, sheet))
+
+def class_file_key(file_path, root=None):
+    """
+    Name a class file is stored under: its path relative to root, or its file name.
+
+    Separators are normalised to '/' so the key is the same on every platform.
+    """
+    if root is None:
+        return os.path.basename(file_path)
+    return os.path.relpath(file_path, root).replace(os.sep, '/')
+
+def process_xlsx_files_in_folder(folder_path, store=None, term=None, fast=False, root=None):
+    """
+    Process all Excel files in the specified folder.
+
+    If a ScoreStore is given, each file's scores are also upserted into it
+    under the given term. Files are stored under their name, or under their
+    path relative to root when folders sharing a store reuse file names.
+    fast selects the streaming XML reader.
+    """
+    if store is not None and not term:
+        raise ValueError("A term is required when storing scores")
+    
     for filename in os.listdir(folder_path):
         if filename.endswith(".xlsx"):
             file_path = os.path.join(folder_path, filename)
-            scores_df = extract_exam_scores(file_path)
+            scores_df = extract_exam_scores(file_path, fast=fast)
             
             if scores_df.empty:
                 logging.warning(f"Skipping file '{filename}' due to missing exam data.")
-                continue
-            
-            # Save scores CSV
-            csv_filename = os.path.splitext(filename)[0] + "_scores.csv"
-            csv_path = os.path.join(folder_path, csv_filename)
-            scores_df.to_csv(csv_path, encoding='utf-8-sig')
-            logging.info(f"Saved: {csv_filename}")
+            else:
+                # Save scores CSV
+                csv_filename = os.path.splitext(filename)[0] + "_scores.csv"
+                csv_path = os.path.join(folder_path, csv_filename)
+                scores_df.to_csv(csv_path, encoding='utf-8-sig')
+                logging.info(f"Saved: {csv_filename}")
+
+            # Stored even when empty, so rows from an earlier import are removed
+            if store is not None:
+                class_file = class_file_key(file_path, root)
+                counts = store.upsert_scores(class_file, scores_df, term)
+                logging.info(f"Stored: {class_file} ({counts['changed']} changed, {counts['removed']} removed)")
+
+    info = date_parser.cache_info()
+    logging.info(f"Date cache: {info['hits']} hits, {info['misses']} misses ({info['hit_rate']:.0%} hit rate)")
 
 # Example usage
 if __name__ == "__main__":
@@ -2,8 +2,13 @@ import os
 from openpyxl import load_workbook
 from datetime import datetime
 import json
-from typing import Dict, List, Optional, Tuple, Any
-import pandas as pd
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Any
+import date_parser
+
+HEADER_MARKER = "التاريخ: السبت"
+HOMEWORK_TYPES = ["مراجعة بعيدة", "مراجعة قريبة", "حفظ"]
 
 class HomeworkData:
     """Class to represent the decoded JSON data structure."""
@@ -13,10 +18,147 @@ class HomeworkData:
         self.homework = json_data['homework']
         self.previous_homework = json_data['previousHomework']
 
+class CellChange(NamedTuple):
+    """A single planned write to the formula workbook."""
+    sheet: str
+    row: int
+    column: int
+    value: Any
+
+class SheetSnapshot:
+    """
+    Plain copy of the cells the planner reads from a student worksheet.
+    
+    Holds no openpyxl objects, so it can be sent to a thread or process pool.
+    """
+    def __init__(self, sheet_name: str, column_a: List[Any], header_row: Optional[int], header_values: List[Any]):
+        self.sheet_name = sheet_name
+        # Values of column A from the data_only workbook; index 0 is row 1
+        self.column_a = column_a
+        self.header_row = header_row
+        # Values of the header row from the formula workbook; index 0 is column 1
+        self.header_values = header_values
+
+def find_header_row(column_a: List[Any]) -> Optional[int]:
+    """Return the 1-based row of the session header in column A, if any."""
+    for row, value in enumerate(column_a, start=1):
+        if value and isinstance(value, str) and HEADER_MARKER in value.strip():
+            return row
+    return None
+
+def find_date_row(column_a: List[Any], header_row: int, target_date: datetime) -> Optional[int]:
+    """Return the 1-based row below the header whose date matches target_date."""
+    target_date = target_date.date()  # Convert to date for comparison
+    date_column = date_parser.new_column()
+    
+    for row in range(header_row + 1, len(column_a) + 1):
+        value = column_a[row - 1]
+        
+        # Skip empty cells
+        if not value:
+            continue
+        
+        # Handles datetimes, strings in the column's format and the DD-MM-YY fallback
+        cell_date = date_parser.parse_date(value, date_column)
+        if cell_date is not None and cell_date.date() == target_date:
+            return row
+    
+    return None
+
+def find_homework_columns_in_row(header_values: List[Any]) -> Tuple[List[str], Optional[int]]:
+    """Find homework type columns and their repetition point in a header row."""
+    homework_types = []
+    repetition_start = None
+    seen_types = set()
+    
+    for col in range(3, len(header_values) + 1):
+        value = header_values[col - 1]
+        if not value:
+            continue
+        
+        cell_text = str(value).strip()
+        
+        if cell_text in seen_types:
+            repetition_start = col
+            break
+        
+        if any(hw_type in cell_text for hw_type in HOMEWORK_TYPES):
+            homework_types.append(cell_text)
+            seen_types.add(cell_text)
+    
+    return homework_types, repetition_start
+
+def plan_student_changes(snapshot: SheetSnapshot, student_name: str, homework_data: HomeworkData) -> Dict[str, Any]:
+    """
+    Compute the cell writes for one student without touching the workbook.
+    
+    Returns:
+        A result dict with 'success', 'error' and the planned 'changes'
+    """
+    try:
+        date_row = None
+        if snapshot.header_row:
+            date_row = find_date_row(snapshot.column_a, snapshot.header_row, homework_data.date)
+        
+        if not snapshot.header_row or not date_row:
+            return {
+                'success': False,
+                'error': "Could not find header row or target date",
+                'changes': []
+            }
+        
+        homework_types, repetition_col = find_homework_columns_in_row(snapshot.header_values)
+        
+        if not repetition_col:
+            return {
+                'success': False,
+                'error': "Could not find homework type repetition",
+                'changes': []
+            }
+        
+        sheet = snapshot.sheet_name
+        changes = []
+        
+        # Attendance
+        attendance_value = "حاضر" if homework_data.attendance[student_name]['present'] else "غائب"
+        changes.append(CellChange(sheet, date_row, 2, attendance_value))
+        
+        # Previous homework grades
+        current_col = 3
+        for hw_type in homework_types:
+            if hw_type in homework_data.previous_homework:
+                grade = homework_data.previous_homework[hw_type].get(student_name, '')
+                if not grade:
+                    continue
+                grade = float(grade)
+                changes.append(CellChange(sheet, date_row, current_col, grade))
+            current_col += 1
+        
+        # New homework assignments
+        current_col = repetition_col
+        for hw_type in homework_types:
+            content = ''
+            for assignment in homework_data.homework['assignments']:
+                is_assignment_relevant = not(assignment['assignedStudents']) or student_name in assignment['assignedStudents']
+                if (assignment['type'] == hw_type and is_assignment_relevant):
+                    content = assignment['content']
+                    break
+            changes.append(CellChange(sheet, date_row, current_col, content))
+            current_col += 1
+        
+        return {'success': True, 'error': None, 'changes': changes}
+    
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'changes': []}
+
 class ExcelProcessor:
     """
     Excel processor that handles formula-based Excel files correctly,
     regardless of which application last saved them.
+    
+    Updates are done in two phases: a planning phase that turns cached sheet
+    snapshots into a list of CellChange records, and an apply phase that
+    writes those records to the formula workbook.
     """
     
     def __init__(self, filepath: str):
@@ -26,11 +168,13 @@ class ExcelProcessor:
         # One for preserving formulas (data_only=False)
         self.formula_wb = None
         self.data_wb = None
+        self._snapshots = {}
     
     def __enter__(self):
         """Load both versions of the workbook when entering the context."""
         self.formula_wb = load_workbook(self.filepath, data_only=False)
         self.data_wb = load_workbook(self.filepath, data_only=True)
+        self._snapshots = {}
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -39,7 +183,7 @@ class ExcelProcessor:
             self.formula_wb.close()
         if self.data_wb:
             self.data_wb.close()
-
+    
     def _get_cell_value(self, worksheet, row: int, col: int) -> Any:
         """
         Get the actual value of a cell, handling both direct values and formulas.
@@ -48,13 +192,40 @@ class ExcelProcessor:
             worksheet: The worksheet from data_wb (with data_only=True)
             row: Row number (1-based)
             col: Column number (1-based)
-            
+        
         Returns:
             The calculated value of the cell
         """
         cell = worksheet.cell(row=row, column=col)
         return cell.value
-
+    
+    def snapshot_sheet(self, sheet_name: str) -> SheetSnapshot:
+        """
+        Read the cells needed for planning from a worksheet, once.
+        
+        Column A comes from the data_only workbook so dates are calculated
+        values; the header row comes from the formula workbook so homework
+        types appear exactly as written in the file.
+        """
+        snapshot = self._snapshots.get(sheet_name)
+        if snapshot is not None:
+            return snapshot
+        
+        data_ws = self.data_wb[sheet_name]
+        column_a = [row[0] for row in data_ws.iter_rows(min_col=1, max_col=1, values_only=True)]
+        header_row = find_header_row(column_a)
+        
+        header_values = []
+        if header_row:
+            formula_ws = self.formula_wb[sheet_name]
+            header_values = list(next(formula_ws.iter_rows(
+                min_row=header_row, max_row=header_row, values_only=True
+            )))
+        
+        snapshot = SheetSnapshot(sheet_name, column_a, header_row, header_values)
+        self._snapshots[sheet_name] = snapshot
+        return snapshot
+    
     def find_header_and_date_row(self, sheet_name: str, target_date: datetime) -> Tuple[Optional[int], Optional[int]]:
         """
         Find both the header row and the target date row.
@@ -65,51 +236,16 @@ class ExcelProcessor:
         Args:
             sheet_name: Name of the worksheet
             target_date: The date we're looking for
-            
+        
         Returns:
             Tuple of (header_row, date_row) numbers
         """
-        # Get the worksheet from our data_only workbook
-        worksheet = self.data_wb[sheet_name]
-        
-        # First find the header row
-        header_row = None
-        for row in range(1, worksheet.max_row + 1):
-            value = self._get_cell_value(worksheet, row, 1)
-            if value and isinstance(value, str) and "التاريخ: السبت" in value.strip():
-                header_row = row
-                break
-        
-        if not header_row:
+        snapshot = self.snapshot_sheet(sheet_name)
+        if not snapshot.header_row:
             return None, None
-            
-        # Now look for the target date in subsequent rows
-        target_date = target_date.date()  # Convert to date for comparison
-        date_row = None
-        
-        for row in range(header_row + 1, worksheet.max_row + 1):
-            value = self._get_cell_value(worksheet, row, 1)
-            
-            # Skip empty cells
-            if not value:
-                continue
-                
-            # Handle different date formats
-            try:
-                if isinstance(value, datetime):
-                    cell_date = value.date()
-                else:
-                    # Try parsing as string
-                    cell_date = pd.to_datetime(value).date()
-                
-                if cell_date == target_date:
-                    date_row = row
-                    break
-            except (ValueError, TypeError):
-                continue
         
-        return header_row, date_row
-
+        return snapshot.header_row, find_date_row(snapshot.column_a, snapshot.header_row, target_date)
+    
     def find_homework_columns(self, sheet_name: str, header_row: int) -> Tuple[List[str], int]:
         """
         Find homework type columns and their repetition point.
@@ -117,108 +253,95 @@ class ExcelProcessor:
         Uses the formula workbook to read the actual column headers,
         ensuring we get the exact text as it appears in the file.
         """
-        worksheet = self.formula_wb[sheet_name]
-        homework_types = []
-        repetition_start = None
-        seen_types = set()
-        
-        for col in range(3, worksheet.max_column + 1):
-            value = worksheet.cell(row=header_row, column=col).value
-            if not value:
-                continue
-                
-            cell_text = str(value).strip()
-            
-            if cell_text in seen_types:
-                repetition_start = col
-                break
-                
-            if any(hw_type in cell_text for hw_type in ["مراجعة بعيدة", "مراجعة قريبة", "حفظ"]):
-                homework_types.append(cell_text)
-                seen_types.add(cell_text)
-        
-        return homework_types, repetition_start
-
+        snapshot = self.snapshot_sheet(sheet_name)
+        if snapshot.header_row == header_row:
+            header_values = snapshot.header_values
+        else:
+            worksheet = self.formula_wb[sheet_name]
+            header_values = list(next(worksheet.iter_rows(
+                min_row=header_row, max_row=header_row, values_only=True
+            )))
+        
+        return find_homework_columns_in_row(header_values)
+    
+    def apply_changes(self, changes: Iterable[CellChange]) -> int:
+        """
+        Write planned changes to the formula workbook.
+        
+        Returns:
+            The number of cells written
+        """
+        worksheets = {}
+        count = 0
+        for change in changes:
+            worksheet = worksheets.get(change.sheet)
+            if worksheet is None:
+                worksheet = worksheets[change.sheet] = self.formula_wb[change.sheet]
+            worksheet.cell(row=change.row, column=change.column, value=change.value)
+            count += 1
+        return count
+    
     def update_student_worksheet(self, student_name: str, homework_data: HomeworkData) -> Dict[str, Any]:
         """Update a single student's worksheet with new data."""
         try:
-            # Get both versions of the worksheet
-            formula_ws = self.formula_wb[student_name]
-            data_ws = self.data_wb[student_name]
-            
-            # Find our target rows using the data worksheet
-            header_row, date_row = self.find_header_and_date_row(
-                student_name,
-                homework_data.date
-            )
-            
-            if not header_row or not date_row:
-                return {
-                    'success': False,
-                    'error': "Could not find header row or target date"
-                }
-            
-            # Find homework columns using the formula worksheet
-            homework_types, repetition_col = self.find_homework_columns(
-                student_name,
-                header_row
-            )
-            
-            if not repetition_col:
-                return {
-                    'success': False,
-                    'error': "Could not find homework type repetition"
-                }
-            
-            # Make updates to the formula worksheet
-            # Update attendance
-            attendance_value = "حاضر" if homework_data.attendance[student_name]['present'] else "غائب"
-            formula_ws.cell(row=date_row, column=2, value=attendance_value)
-            
-            # Update previous homework grades
-            current_col = 3
-            for hw_type in homework_types:
-                if hw_type in homework_data.previous_homework:
-                    grade = homework_data.previous_homework[hw_type].get(student_name, '')
-                    if not grade:
-                        continue
-                    grade = float(grade)
-                    formula_ws.cell(row=date_row, column=current_col, value=grade)
-                current_col += 1
-            
-            # Update new homework assignments
-            current_col = repetition_col
-            for hw_type in homework_types:
-                content = ''
-                for assignment in homework_data.homework['assignments']:
-                    is_assignment_relevant = not(assignment['assignedStudents']) or student_name in assignment['assignedStudents']
-                    if (assignment['type'] == hw_type and is_assignment_relevant):
-                        content = assignment['content']
-                        break
-                formula_ws.cell(row=date_row, column=current_col, value=content)
-                current_col += 1
-            
-            return {'success': True, 'error': None}
-            
+            result = plan_student_changes(self.snapshot_sheet(student_name), student_name, homework_data)
         except Exception as e:
-            return {'success': False, 'error': str(e)}
-
-    def process_workbook(self, homework_data: HomeworkData) -> Dict[str, Any]:
-        """Process the entire workbook."""
+            return {'success': False, 'error': str(e), 'changes': []}
+        
+        self.apply_changes(result['changes'])
+        return result
+    
+    def plan_workbook(self, homework_data: HomeworkData, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Plan the changes for every student without writing anything.
+        
+        Args:
+            homework_data: The decoded homework data
+            executor: Optional thread or process pool to plan students in parallel
+        
+        Returns:
+            Per-student result dicts with 'success', 'error' and 'changes'
+        """
         results = {}
+        names = []
+        snapshots = []
         
         for student_name in homework_data.attendance.keys():
             if student_name in self.formula_wb.sheetnames:
-                results[student_name] = self.update_student_worksheet(
-                    student_name,
-                    homework_data
-                )
+                names.append(student_name)
+                snapshots.append(self.snapshot_sheet(student_name))
             else:
                 results[student_name] = {
                     'success': False,
-                    'error': f"Worksheet not found for student: {student_name}"
+                    'error': f"Worksheet not found for student: {student_name}",
+                    'changes': []
                 }
         
+        if executor is not None:
+            plans = executor.map(plan_student_changes, snapshots, names, repeat(homework_data))
+        else:
+            plans = map(plan_student_changes, snapshots, names, repeat(homework_data))
+        
+        for student_name, plan in zip(names, plans):
+            results[student_name] = plan
+        
+        # Keep the students in payload order
+        return {name: results[name] for name in homework_data.attendance.keys()}
+    
+    def process_workbook(self, homework_data: HomeworkData, executor: Optional[Executor] = None,
+                         dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Process the entire workbook.
+        
+        With dry_run the change-set is planned and validated but not written.
+        """
+        results = self.plan_workbook(homework_data, executor)
+        
+        if not dry_run:
+            self.apply_changes(
+                change for result in results.values() for change in result['changes']
+            )
+        
         return results
     
     def save(self, output_path: Optional[str] = None):
@@ -233,13 +356,21 @@ class ExcelProcessor:
 def process_excel_file(
     excel_path: str,
     json_data: dict,
-    output_path: Optional[str] = None
+    output_path: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    dry_run: bool = False
 ) -> Dict[str, Any]:
-    """Process an Excel file with the provided JSON data."""
+    """
+    Process an Excel file with the provided JSON data.
+    
+    With dry_run the payload is validated against the workbook and the
+    planned changes are returned, but nothing is written or saved.
+    """
     homework_data = HomeworkData(json_data)
     
     with ExcelProcessor(excel_path) as processor:
-        results = processor.process_workbook(homework_data)
-        processor.save(output_path)
-        
-    return results
\ No newline at end of file
+        results = processor.process_workbook(homework_data, executor, dry_run)
+        if not dry_run:
+            processor.save(output_path)
+    
+    return results
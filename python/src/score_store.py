@@ -0,0 +1,259 @@
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    class_file TEXT NOT NULL,
+    student_sheet TEXT NOT NULL,
+    term TEXT NOT NULL,
+    attended INTEGER NOT NULL,
+    total_sessions INTEGER NOT NULL,
+    attendance_rate REAL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (class_file, student_sheet, term)
+);
+
+CREATE TABLE IF NOT EXISTS exam_scores (
+    class_file TEXT NOT NULL,
+    student_sheet TEXT NOT NULL,
+    term TEXT NOT NULL,
+    section TEXT NOT NULL,
+    score TEXT,
+    score_value REAL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (class_file, student_sheet, term, section)
+);
+
+-- Each threshold query has a term-scoped and an all-terms form, so both
+-- orders are indexed to keep the all-terms form off a full table scan.
+CREATE INDEX IF NOT EXISTS idx_students_term_rate
+    ON students (term, attendance_rate);
+CREATE INDEX IF NOT EXISTS idx_students_rate
+    ON students (attendance_rate, term);
+CREATE INDEX IF NOT EXISTS idx_students_sheet
+    ON students (student_sheet, term);
+CREATE INDEX IF NOT EXISTS idx_scores_term_section
+    ON exam_scores (term, section, score_value);
+CREATE INDEX IF NOT EXISTS idx_scores_section_value
+    ON exam_scores (section, score_value, term);
+CREATE INDEX IF NOT EXISTS idx_scores_class_section
+    ON exam_scores (class_file, term, section, score_value);
+"""
+
+# The update clauses only fire when a value actually differs, so re-importing
+# an unchanged file leaves every row (and its updated_at) untouched.
+UPSERT_STUDENT = """
+INSERT INTO students (class_file, student_sheet, term, attended, total_sessions, attendance_rate, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (class_file, student_sheet, term) DO UPDATE SET
+    attended = excluded.attended,
+    total_sessions = excluded.total_sessions,
+    attendance_rate = excluded.attendance_rate,
+    updated_at = excluded.updated_at
+WHERE students.attended IS NOT excluded.attended
+   OR students.total_sessions IS NOT excluded.total_sessions
+"""
+
+UPSERT_SCORE = """
+INSERT INTO exam_scores (class_file, student_sheet, term, section, score, score_value, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (class_file, student_sheet, term, section) DO UPDATE SET
+    score = excluded.score,
+    score_value = excluded.score_value,
+    updated_at = excluded.updated_at
+WHERE exam_scores.score IS NOT excluded.score
+"""
+
+def parse_attendance(value: Any) -> Tuple[int, int]:
+    """Parse an 'attended/total' string as produced by extract_exam_scores."""
+    try:
+        attended, total = str(value).split('/', 1)
+        return int(attended), int(total)
+    except (ValueError, TypeError):
+        return 0, 0
+
+def to_score_value(value: Any) -> Optional[float]:
+    """Return the numeric form of a score cell, or None for text scores."""
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isna(number) else number
+
+def unique_section_names(sections: List[str]) -> List[str]:
+    """Number repeated section names ('X', 'X (2)', ...) so each keeps its own row."""
+    counts = {}
+    names = []
+    for section in sections:
+        counts[section] = counts.get(section, 0) + 1
+        names.append(section if counts[section] == 1 else f"{section} ({counts[section]})")
+    return names
+
+class ScoreStore:
+    """
+    Local SQLite store for the output of exam_extractor.extract_exam_scores.
+
+    Rows are keyed by class file, student sheet and term so results from
+    every class can be queried together without reopening any Excel file.
+    The class file name must be unique within one database: two files
+    stored under the same name replace each other's rows.
+    """
+
+    def __init__(self, db_path: str = 'scores.db'):
+        self.db_path = db_path
+        self.conn = None
+
+    def __enter__(self):
+        """Open the database and make sure the schema exists."""
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the database connection on exit."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def upsert_scores(self, class_file: str, scores_df: pd.DataFrame, term: str) -> Dict[str, int]:
+        """
+        Upsert one file's extracted scores.
+
+        Args:
+            class_file: Name of the class Excel file the scores came from
+            scores_df: DataFrame returned by extract_exam_scores (one row per
+                student sheet, an 'Attendance' column plus one per exam section;
+                repeated section names are stored as 'X', 'X (2)', ...). An
+                empty frame removes the file's rows for the term.
+            term: Label of the term the scores belong to
+
+        Returns:
+            Counts of rows changed and removed by this import
+        """
+        if not term:
+            raise ValueError("A term is required when storing scores")
+
+        now = datetime.now().isoformat(timespec='seconds')
+        # Work by column position: section labels can repeat within a sheet
+        labels = [str(col) for col in scores_df.columns]
+        attendance_pos = None
+        if 'Attendance' in labels:
+            attendance_pos = len(labels) - 1 - labels[::-1].index('Attendance')
+        section_positions = [pos for pos in range(len(labels)) if pos != attendance_pos]
+        sections = unique_section_names([labels[pos] for pos in section_positions])
+        student_rows = []
+        score_rows = []
+
+        for student_sheet, *values in scores_df.itertuples(name=None):
+            attended, total = parse_attendance(values[attendance_pos]) if attendance_pos is not None else (0, 0)
+            rate = attended / total if total > 0 else None
+            student_rows.append((class_file, student_sheet, term, attended, total, rate, now))
+
+            for pos, section in zip(section_positions, sections):
+                value = values[pos]
+                score = None if pd.isna(value) else str(value)
+                score_rows.append((class_file, student_sheet, term, section,
+                                   score, to_score_value(value), now))
+
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(UPSERT_STUDENT, student_rows)
+            self.conn.executemany(UPSERT_SCORE, score_rows)
+            changed = self.conn.total_changes - before
+
+            removed = self._remove_stale_rows(class_file, term, list(scores_df.index), sections)
+
+        return {'changed': changed, 'removed': removed}
+
+    def _remove_stale_rows(self, class_file: str, term: str,
+                           student_sheets: List[str], sections: List[str]) -> int:
+        """Delete rows for sheets or sections that are no longer in the file."""
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS current_sheets (name TEXT PRIMARY KEY)")
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS current_sections (name TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM current_sheets")
+        self.conn.execute("DELETE FROM current_sections")
+        self.conn.executemany("INSERT OR IGNORE INTO current_sheets VALUES (?)",
+                              [(str(name),) for name in student_sheets])
+        self.conn.executemany("INSERT OR IGNORE INTO current_sections VALUES (?)",
+                              [(str(name),) for name in sections])
+        # Start counting after the temp-table bookkeeping so only real deletions count
+        before = self.conn.total_changes
+
+        for table in ('students', 'exam_scores'):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE class_file = ? AND term = ? "
+                "AND student_sheet NOT IN (SELECT name FROM current_sheets)",
+                (class_file, term)
+            )
+        self.conn.execute(
+            "DELETE FROM exam_scores WHERE class_file = ? AND term = ? "
+            "AND section NOT IN (SELECT name FROM current_sections)",
+            (class_file, term)
+        )
+        return self.conn.total_changes - before
+
+    def students_below_attendance(self, threshold: float, term: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List students whose attendance rate is below the threshold.
+
+        Args:
+            threshold: Attendance rate between 0 and 1 (e.g. 0.7 for 70%)
+            term: Restrict to a single term, or None for all terms
+        """
+        query = ("SELECT class_file, student_sheet, term, attended, total_sessions, attendance_rate "
+                 "FROM students WHERE attendance_rate < ?")
+        params = [threshold]
+        if term is not None:
+            query += " AND term = ?"
+            params.append(term)
+        query += " ORDER BY attendance_rate, class_file, student_sheet"
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def class_attendance_summary(self, term: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Overall attendance per class file."""
+        query = ("SELECT class_file, term, COUNT(*) AS students, "
+                 "SUM(attended) AS attended, SUM(total_sessions) AS total_sessions, "
+                 "AVG(attendance_rate) AS average_rate FROM students")
+        params = []
+        if term is not None:
+            query += " WHERE term = ?"
+            params.append(term)
+        query += " GROUP BY class_file, term ORDER BY average_rate"
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def section_averages(self, term: Optional[str] = None, by_class: bool = False) -> List[Dict[str, Any]]:
+        """
+        Average numeric score per exam section, across classes or per class.
+
+        Text scores are ignored in the averages but still counted.
+        """
+        group = "class_file, term, section" if by_class else "term, section"
+        query = (f"SELECT {group}, COUNT(*) AS students, COUNT(score_value) AS graded, "
+                 "AVG(score_value) AS average, MIN(score_value) AS minimum, "
+                 "MAX(score_value) AS maximum FROM exam_scores")
+        params = []
+        if term is not None:
+            query += " WHERE term = ?"
+            params.append(term)
+        query += f" GROUP BY {group} ORDER BY {group}"
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def students_below_score(self, section: str, threshold: float, term: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List students whose numeric score in a section is below the threshold."""
+        query = ("SELECT class_file, student_sheet, term, score, score_value "
+                 "FROM exam_scores WHERE section = ? AND score_value < ?")
+        params = [section, threshold]
+        if term is not None:
+            query += " AND term = ?"
+            params.append(term)
+        query += " ORDER BY score_value, class_file, student_sheet"
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def student_history(self, student_sheet: str) -> List[Dict[str, Any]]:
+        """All stored attendance records for a student sheet, across classes and terms."""
+        query = ("SELECT class_file, student_sheet, term, attended, total_sessions, attendance_rate "
+                 "FROM students WHERE student_sheet = ? ORDER BY term, class_file")
+        return [dict(row) for row in self.conn.execute(query, (student_sheet,))]
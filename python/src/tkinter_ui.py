@@ -1,16 +1,49 @@
+import argparse
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
 from openpyxl import load_workbook
 import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
 from encoder_decoder import decode_data
 from excel_processor import process_excel_file
+from ui_monitor import ResponsivenessMonitor, tracked
+
+def preview_text(value):
+    """
+    Text a preview cell shows for a value.
+    
+    Values read_excel would load as NaN (None and its default NA strings,
+    including '') show as 'nan', so a patched cell looks the same as it
+    will after the sheet is reloaded from disk.
+    """
+    if value is None or (isinstance(value, str) and value in STR_NA_VALUES):
+        return 'nan'
+    return str(value)
+
+def preview_position(row, column, row_count, column_count):
+    """
+    Map an Excel cell to its (row, column) index in a sheet's preview table.
+    
+    Row 1 is the DataFrame header, so Excel row n is table row n - 2.
+    Returns None if the cell is outside the table and the sheet must be reloaded.
+    """
+    row_idx = row - 2
+    col_idx = column - 1
+    if not (0 <= row_idx < row_count) or not (0 <= col_idx < column_count):
+        return None
+    return row_idx, col_idx
 
 class ExcelProcessorApp:
-    def __init__(self, root):
+    def __init__(self, root, monitor=None):
         self.root = root
         self.root.title("Excel File Processor")
         
+        # Optional ResponsivenessMonitor for event-loop lag and action timings
+        self.monitor = monitor
+        if self.monitor:
+            self.monitor.start()
+        
         # Configure the root window to be more spacious
         self.root.geometry("1200x800")
         
@@ -72,7 +105,7 @@ class ExcelProcessorApp:
             
             # Process the Excel file with our decoded data
             try:
-                results = process_excel_file(excel_path, json_data)
+                results = self.process_file(excel_path, json_data)
                 
                 # Check results and show appropriate message
                 failures = [name for name, result in results.items() 
@@ -86,8 +119,10 @@ class ExcelProcessorApp:
                 else:
                     messagebox.showinfo("Success", "File updated successfully!")
                     
-                # Refresh the current view
-                self.refresh_current_tab()
+                # Patch only the changed cells in the preview
+                changes = [change for result in results.values()
+                          for change in result['changes']]
+                self.refresh_changed_cells(filename, changes)
                 
             except Exception as e:
                 messagebox.showerror("Processing Error", 
@@ -96,24 +131,62 @@ class ExcelProcessorApp:
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
             
-    def refresh_current_tab(self):
-        """Refreshes the current tab's content after an update."""
-        current_tab = self.notebook.select()
-        if current_tab:
-            tab_id = self.notebook.index(current_tab)
-            filename = self.notebook.tab(tab_id)['text']
+    @tracked('update_current_file')
+    def process_file(self, excel_path, json_data):
+        """Applies the decoded data to an Excel file; kept apart from the dialogs so it can be timed."""
+        return process_excel_file(excel_path, json_data)
+    
+    @tracked('refresh')
+    def refresh_changed_cells(self, filename, changes):
+        """
+        Patches the preview tables of a file in place after an update.
+        
+        Only the rows touched by the changes are rewritten, so the cost
+        depends on the number of edits rather than the size of the file.
+        Sheets whose layout doesn't match the change are reloaded on their own.
+        """
+        tables = self.sheet_tables.get(filename, {})
+        stale_sheets = set()
+        patched_rows = {}
+        
+        for change in changes:
+            entry = tables.get(change.sheet)
+            if entry is None:
+                continue
             
-            # Store the current position of the text widget
-            text_widget = self.text_widgets.get(filename)
-            if text_widget:
-                text_content = text_widget.get("1.0", tk.END)
+            position = preview_position(change.row, change.column,
+                                        len(entry['items']), len(entry['columns']))
+            if position is None:
+                stale_sheets.add(change.sheet)
+                continue
             
-            # Reload the tab
-            self.create_file_tab(filename)
-            
-            # Restore the text content
-            if text_content:
-                self.text_widgets[filename].insert("1.0", text_content)
+            row_idx, col_idx = position
+            key = (change.sheet, row_idx)
+            if key not in patched_rows:
+                patched_rows[key] = list(entry['table'].item(entry['items'][row_idx], 'values'))
+                patched_rows[key] += [preview_text(None)] * (len(entry['columns']) - len(patched_rows[key]))
+            patched_rows[key][col_idx] = preview_text(change.value)
+        
+        for (sheet_name, row_idx), values in patched_rows.items():
+            if sheet_name in stale_sheets:
+                continue
+            entry = tables[sheet_name]
+            entry['table'].item(entry['items'][row_idx], values=values)
+        
+        for sheet_name in stale_sheets:
+            self.reload_sheet(filename, sheet_name)
+    
+    def reload_sheet(self, filename, sheet_name):
+        """Re-reads a single sheet from disk and refills its existing table."""
+        entry = self.sheet_tables[filename][sheet_name]
+        filepath = os.path.join(self.current_folder, filename)
+        df = pd.read_excel(filepath, sheet_name=sheet_name)
+        
+        table = entry['table']
+        table.delete(*table.get_children())
+        self.configure_table_columns(table, df)
+        entry['columns'] = list(df.columns)
+        entry['items'] = self.fill_table(table, df)
 
     def create_file_tab(self, filename):
         """Creates a new tab for an Excel file with text area and sheet tabs."""
@@ -177,9 +250,15 @@ class ExcelProcessorApp:
                 sheet_frame = ttk.Frame(sheet_notebook)
                 sheet_notebook.add(sheet_frame, text=sheet_name)
                 
-                table_frame = self.create_table_frame(sheet_frame, df)
+                table_frame, table, items = self.create_table_frame(sheet_frame, df)
                 table_frame.pack(fill=tk.BOTH, expand=True)
                 
+                self.sheet_tables[filename][sheet_name] = {
+                    'table': table,
+                    'columns': list(df.columns),
+                    'items': items
+                }
+                
             workbook.close()
             
         except Exception as e:
@@ -194,7 +273,11 @@ class ExcelProcessorApp:
             error_label.pack(expand=True)
 
     def create_table_frame(self, parent, data):
-        """Creates a scrollable frame containing a table."""
+        """
+        Creates a scrollable frame containing a table.
+        
+        Returns the frame, the table and the item ids of its rows in order.
+        """
         frame = ttk.Frame(parent)
         
         y_scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
@@ -213,26 +296,39 @@ class ExcelProcessorApp:
         frame.grid_rowconfigure(0, weight=1)
         frame.grid_columnconfigure(0, weight=1)
         
+        self.configure_table_columns(table, data)
+        items = self.fill_table(table, data)
+        
+        return frame, table, items
+    
+    def configure_table_columns(self, table, data):
+        """Sets the table's columns and headings from a DataFrame."""
         table['columns'] = list(data.columns)
         table.column('#0', width=0, stretch=tk.NO)
         
         for col in data.columns:
             table.heading(col, text=col)
             table.column(col, width=100)
-        
-        for idx, row in data.iterrows():
-            table.insert('', 'end', values=list(row))
-        
-        return frame
+    
+    def fill_table(self, table, data):
+        """Inserts the DataFrame rows into the table and returns their item ids."""
+        return [table.insert('', 'end', values=[preview_text(value) for value in row])
+                for idx, row in data.iterrows()]
 
     def browse_folder(self):
         """Handles folder selection and updates the UI accordingly."""
         folder = filedialog.askdirectory()
         if folder:
-            self.current_folder = folder
-            self.folder_var.set(folder)
-            self.update_tabs()
+            self.open_folder(folder)
+    
+    @tracked('browse_folder')
+    def open_folder(self, folder):
+        """Loads the selected folder; separate from the dialog so only the loading is timed."""
+        self.current_folder = folder
+        self.folder_var.set(folder)
+        self.update_tabs()
             
+    @tracked('update_tabs')
     def update_tabs(self):
         """Updates the tabs based on Excel files in the selected folder."""
         for tab in self.notebook.tabs():
@@ -258,8 +354,24 @@ class ExcelProcessorApp:
             message_label.pack(expand=True)
 
 def main():
+    parser = argparse.ArgumentParser(description="Excel File Processor")
+    parser.add_argument('--monitor', action='store_true',
+                        help="log event-loop stalls and action timings to ui_monitor.log")
+    parser.add_argument('--profile-threshold', type=float, metavar='MS',
+                        help="with --monitor, save a cProfile dump for actions slower than MS")
+    args = parser.parse_args()
+    
     root = tk.Tk()
-    app = ExcelProcessorApp(root)
+    monitor = None
+    if args.monitor:
+        monitor = ResponsivenessMonitor(root, profile_threshold_ms=args.profile_threshold)
+        
+        def on_close():
+            monitor.stop()
+            root.destroy()
+        root.protocol("WM_DELETE_WINDOW", on_close)
+        
+    app = ExcelProcessorApp(root, monitor)
     root.mainloop()
 
 if __name__ == "__main__":
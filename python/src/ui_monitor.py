@@ -0,0 +1,159 @@
+import cProfile
+import functools
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Optional
+
+class ResponsivenessMonitor:
+    """
+    Measures Tk event-loop lag and attributes stalls to the active UI action.
+
+    A heartbeat is scheduled with root.after every interval; when it fires
+    later than expected the event loop was blocked, and the stall is logged
+    together with the actions that ran during it. Actions are wrapped with
+    track() (or the tracked decorator) and can optionally be profiled with
+    cProfile, keeping a dump for any run slower than the profile threshold.
+    """
+
+    def __init__(
+        self,
+        root,
+        log_path: str = 'ui_monitor.log',
+        interval_ms: int = 100,
+        stall_threshold_ms: float = 200,
+        profile_threshold_ms: Optional[float] = None,
+        profile_dir: str = 'profiles',
+        max_bytes: int = 1_000_000,
+        backup_count: int = 3
+    ):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.profile_threshold_ms = profile_threshold_ms
+        self.profile_dir = profile_dir
+
+        self.logger = logging.getLogger('ui_monitor')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handler = RotatingFileHandler(log_path, maxBytes=max_bytes,
+                                           backupCount=backup_count, encoding='utf-8')
+        self.handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+        self._after_id = None
+        self._expected = None
+        self._active = []
+        # (action, start, end) of recently finished actions, for attributing stalls
+        self._recent = deque(maxlen=32)
+        self._profiler = None
+        self.stats = {}
+
+    def start(self):
+        """Start logging and schedule the first heartbeat."""
+        if self._after_id is not None:
+            return
+        self.logger.addHandler(self.handler)
+        self.logger.info(f"Monitor started (interval {self.interval_ms} ms, "
+                         f"stall threshold {self.stall_threshold_ms} ms)")
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def stop(self):
+        """Cancel the heartbeat, log a per-action summary and close the log."""
+        if self._after_id is None:
+            return
+        self.root.after_cancel(self._after_id)
+        self._after_id = None
+
+        for action, stat in sorted(self.stats.items()):
+            self.logger.info(f"Summary {action}: {stat['count']} runs, "
+                             f"avg {stat['total_ms'] / stat['count']:.0f} ms, max {stat['max_ms']:.0f} ms")
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def _beat(self):
+        """Heartbeat callback; any delay beyond the interval is event-loop lag."""
+        now = time.perf_counter()
+        lag_ms = (now - self._expected) * 1000
+        if lag_ms >= self.stall_threshold_ms:
+            actions = self._actions_between(self._expected, now)
+            culprit = ', '.join(actions) if actions else 'unattributed'
+            self.logger.warning(f"Event loop stalled for {lag_ms:.0f} ms during: {culprit}")
+
+        self._expected = now + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _actions_between(self, start: float, end: float):
+        """Names of the actions that were running at any point in [start, end]."""
+        names = [action for action, action_start, action_end in self._recent
+                 if action_end >= start and action_start <= end]
+        names.extend(action for action, _ in self._active)
+        return list(dict.fromkeys(names))
+
+    @contextmanager
+    def track(self, action: str):
+        """
+        Mark a block of code as a UI action.
+
+        Nested actions are attributed separately, but only the outermost
+        one is profiled since cProfile cannot run twice at once.
+        """
+        start = time.perf_counter()
+        profiler = None
+        if self.profile_threshold_ms is not None and self._profiler is None:
+            profiler = self._profiler = cProfile.Profile()
+            profiler.enable()
+
+        self._active.append((action, start))
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiler = None
+            end = time.perf_counter()
+            self._active.pop()
+            self._record(action, start, end, profiler)
+
+    def _record(self, action: str, start: float, end: float, profiler: Optional[cProfile.Profile]):
+        """Log an action's duration and keep its profile if it was slow."""
+        duration_ms = (end - start) * 1000
+        self._recent.append((action, start, end))
+
+        stat = self.stats.setdefault(action, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stat['count'] += 1
+        stat['total_ms'] += duration_ms
+        stat['max_ms'] = max(stat['max_ms'], duration_ms)
+
+        level = logging.WARNING if duration_ms >= self.stall_threshold_ms else logging.INFO
+        self.logger.log(level, f"Action {action} took {duration_ms:.0f} ms")
+
+        if profiler is not None and duration_ms >= self.profile_threshold_ms:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            filename = f"{action}-{datetime.now():%Y%m%d-%H%M%S-%f}.prof"
+            path = os.path.join(self.profile_dir, filename)
+            profiler.dump_stats(path)
+            self.logger.warning(f"Profile for {action} saved to {path}")
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-action run count, total and maximum duration in milliseconds."""
+        return {action: dict(stat) for action, stat in self.stats.items()}
+
+def tracked(action: str):
+    """
+    Decorator that tracks a method as a UI action on self.monitor, if one is set.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            monitor = getattr(self, 'monitor', None)
+            if monitor is None:
+                return method(self, *args, **kwargs)
+            with monitor.track(action):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
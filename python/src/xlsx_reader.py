@@ -0,0 +1,229 @@
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Built-in number formats that Excel renders as dates or times
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | {45, 46, 47} | set(range(50, 59))
+
+# Strips quoted literals, [colour]/[locale] sections and escaped characters
+# before looking for date tokens in a custom number format
+_FORMAT_NOISE = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.|_.|\*.')
+_DATE_TOKENS = re.compile(r'[dmyhs]', re.IGNORECASE)
+
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+
+def _local(tag: str) -> str:
+    """Return an element tag without its namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+def column_index(letters: str) -> int:
+    """Convert column letters (e.g. 'AB') to a 1-based column index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+class SharedStrings:
+    """
+    Shared string table that is parsed only as far as the highest index asked for.
+    """
+    def __init__(self, archive: zipfile.ZipFile, path: Optional[str]):
+        self._strings = []
+        self._source = None
+        self._events = None
+        self._root = None
+        if path and path in archive.namelist():
+            self._source = archive.open(path)
+            self._events = ET.iterparse(self._source, events=('start', 'end'))
+
+    def __getitem__(self, index: int) -> str:
+        while index >= len(self._strings) and self._events is not None:
+            self._advance()
+        return self._strings[index]
+
+    def _advance(self):
+        """Parse the next <si> entry."""
+        for event, elem in self._events:
+            if event == 'start':
+                if self._root is None:
+                    self._root = elem
+                continue
+            if _local(elem.tag) != 'si':
+                continue
+            # Phonetic runs (<rPh>) are annotations, not part of the text
+            parts = []
+            for child in elem.iter():
+                name = _local(child.tag)
+                if name == 'rPh':
+                    for text in child.iter():
+                        text.text = None
+                elif name == 't' and child.text:
+                    parts.append(child.text)
+            self._strings.append(''.join(parts))
+            # Drop parsed entries from the tree; only the strings are kept
+            self._root.clear()
+            return
+        self.close()
+
+    def close(self):
+        if self._source is not None:
+            self._source.close()
+        self._source = None
+        self._events = None
+
+class XlsxReader:
+    """
+    Streaming reader for the cell values of an .xlsx file.
+
+    Sheets are read with iterparse straight from the zip archive, one row at a
+    time, so memory use does not grow with the size of the sheet. Values are
+    the cached results Excel stored, like openpyxl's data_only mode.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.archive = None
+        self.shared_strings = None
+        self._sheet_paths = {}
+        self._date_styles = set()
+        self._epoch = datetime(1899, 12, 30)
+
+    def __enter__(self):
+        """Open the archive and read the workbook index and styles."""
+        self.archive = zipfile.ZipFile(self.filepath)
+        self._read_workbook()
+        self._read_styles()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the shared strings stream and the archive."""
+        if self.shared_strings:
+            self.shared_strings.close()
+        if self.archive:
+            self.archive.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheet_paths)
+
+    def _read_workbook(self):
+        """Map sheet names to their XML paths and find the shared strings part."""
+        rels = {}
+        shared_strings_path = None
+        rels_root = ET.fromstring(self.archive.read('xl/_rels/workbook.xml.rels'))
+        for rel in rels_root:
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join('xl', target))
+            rels[rel.get('Id')] = target
+            if rel.get('Type', '').endswith('/sharedStrings'):
+                shared_strings_path = target
+
+        workbook_root = ET.fromstring(self.archive.read('xl/workbook.xml'))
+        for elem in workbook_root.iter():
+            name = _local(elem.tag)
+            if name == 'workbookPr' and elem.get('date1904') in ('1', 'true'):
+                self._epoch = datetime(1904, 1, 1)
+            elif name == 'sheet':
+                rel_id = next((value for key, value in elem.attrib.items() if _local(key) == 'id'), None)
+                if rel_id in rels:
+                    self._sheet_paths[elem.get('name')] = rels[rel_id]
+
+        self.shared_strings = SharedStrings(self.archive, shared_strings_path)
+
+    def _read_styles(self):
+        """Find the cell style indexes whose number format is a date."""
+        if 'xl/styles.xml' not in self.archive.namelist():
+            return
+
+        styles_root = ET.fromstring(self.archive.read('xl/styles.xml'))
+        custom_date_formats = set()
+        for elem in styles_root.iter():
+            if _local(elem.tag) == 'numFmt':
+                code = _FORMAT_NOISE.sub('', elem.get('formatCode', ''))
+                if _DATE_TOKENS.search(code):
+                    custom_date_formats.add(int(elem.get('numFmtId')))
+
+        for elem in styles_root:
+            if _local(elem.tag) != 'cellXfs':
+                continue
+            for index, xf in enumerate(elem):
+                fmt_id = int(xf.get('numFmtId', 0))
+                if fmt_id in BUILTIN_DATE_FORMATS or fmt_id in custom_date_formats:
+                    self._date_styles.add(index)
+
+    def _cell_value(self, cell) -> Any:
+        """Convert a <c> element to a Python value, or None if it is empty."""
+        cell_type = cell.get('t', 'n')
+
+        if cell_type == 'inlineStr':
+            value = ''.join(t.text or '' for t in cell.iter() if _local(t.tag) == 't')
+            return value or None
+
+        raw = None
+        for child in cell:
+            if _local(child.tag) == 'v':
+                raw = child.text
+                break
+        if raw is None:
+            return None
+
+        if cell_type == 's':
+            return self.shared_strings[int(raw)] or None
+        if cell_type == 'str':
+            return raw or None
+        if cell_type == 'd':
+            try:
+                return datetime.fromisoformat(raw)
+            except ValueError:
+                return raw or None
+        if cell_type == 'b':
+            return raw == '1'
+        if cell_type == 'e':
+            return None
+
+        number = float(raw)
+        if int(cell.get('s', 0)) in self._date_styles:
+            return self._epoch + timedelta(days=number)
+        return int(number) if number.is_integer() else number
+
+    def iter_rows(self, sheet_name: str) -> Iterator[Tuple[int, Dict[int, Any]]]:
+        """
+        Yield (row_number, {column_index: value}) for each non-empty row.
+
+        Only cells with a value are included. Stopping the iteration early
+        stops reading the sheet.
+        """
+        with self.archive.open(self._sheet_paths[sheet_name]) as source:
+            row_number = 0
+            sheet_data = None
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if _local(elem.tag) == 'sheetData':
+                        sheet_data = elem
+                    continue
+                if _local(elem.tag) != 'row':
+                    continue
+
+                row_number = int(elem.get('r', row_number + 1))
+                cells = {}
+                col = 0
+                for cell in elem:
+                    if _local(cell.tag) != 'c':
+                        continue
+                    match = _CELL_REF.match(cell.get('r', ''))
+                    col = column_index(match.group(1)) if match else col + 1
+                    value = self._cell_value(cell)
+                    if value is not None:
+                        cells[col] = value
+
+                # Drop the finished row so the tree never holds more than one
+                if sheet_data is not None:
+                    sheet_data.clear()
+                if cells:
+                    yield row_number, cells
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules in src are imported by name, as the scripts there do
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -0,0 +1,71 @@
+"""
+Times extract_exam_scores with and without fast=True on a generated workbook.
+
+Run from this directory: python benchmark.py [--sheets N] [--sessions N] [--repeat N]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import Workbook
+
+from make_fixtures import add_exam_block, add_sessions, new_student_sheet
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from exam_extractor import extract_exam_scores  # noqa: E402
+
+
+def build_class_workbook(path, sheets, sessions):
+    """One sheet per student, each with a term of sessions and an exam block."""
+    wb = Workbook()
+    wb.remove(wb.active)
+    statuses = ['حاضر', 'حاضر', 'غائب']
+    for number in range(sheets):
+        ws = new_student_sheet(wb, f'طالب {number + 1}')
+        row = add_sessions(ws, 3, datetime(2024, 9, 7),
+                           [statuses[(number + i) % len(statuses)] for i in range(sessions)])
+        add_exam_block(ws, row + 1, [number % 10, 'غ' if number % 7 == 0 else 8, 6.5])
+    wb.save(path)
+
+
+def best_time(path, fast, repeat):
+    """Best wall time of `repeat` runs, and the result of the last one."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract_exam_scores(path, fast=fast)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=30)
+    parser.add_argument('--sessions', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Per-row debug logging would dominate both timings
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'class.xlsx')
+        build_class_workbook(path, args.sheets, args.sessions)
+
+        pandas_time, expected = best_time(path, False, args.repeat)
+        fast_time, actual = best_time(path, True, args.repeat)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(f"{args.sheets} sheets x {args.sessions} sessions, best of {args.repeat}")
+    print(f"pandas:    {pandas_time * 1000:8.1f} ms")
+    print(f"fast=True: {fast_time * 1000:8.1f} ms ({pandas_time / fast_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
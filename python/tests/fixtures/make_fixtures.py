@@ -0,0 +1,106 @@
+"""
+Builds the workbook fixtures used by test_exam_extractor.py.
+
+Run from this directory to regenerate them: python make_fixtures.py
+"""
+import os
+from datetime import datetime, timedelta
+from openpyxl import Workbook
+
+EXAM_ANCHOR = "امتحان الفصل الدراسى الثانى"
+SECTIONS = ['حفظ', 'تجويد', 'تفسير']
+
+
+def add_sessions(ws, row, first_date, statuses, as_text=False):
+    """Write one session row per status, a week apart, and return the next free row."""
+    for offset, status in enumerate(statuses):
+        date = first_date + timedelta(days=7 * offset)
+        ws.cell(row, 1, date.strftime('%Y-%m-%d') if as_text else date)
+        if status:
+            ws.cell(row, 2, status)
+        row += 1
+    return row
+
+
+def add_exam_block(ws, row, scores):
+    """Write the exam anchor with its sections and scores rows, and return the next free row."""
+    ws.cell(row, 3, EXAM_ANCHOR)
+    for col, (section, score) in enumerate(zip(SECTIONS, scores), start=2):
+        ws.cell(row + 1, col, section)
+        if score is not None:
+            ws.cell(row + 2, col, score)
+    return row + 3
+
+
+def new_student_sheet(wb, name):
+    ws = wb.create_sheet(name)
+    ws['A1'] = 'بيانات الطالب'
+    ws['A2'] = 'التاريخ: السبت'
+    return ws
+
+
+def build_sessions_before_exam(path):
+    """Session rows above the exam block, with date cells and date strings."""
+    wb = Workbook()
+    wb.remove(wb.active)
+    wb.create_sheet('Tabelle1')['A1'] = 'ignored'
+    new_student_sheet(wb, 'الطالب')['A3'] = 'ignored'
+
+    ws = new_student_sheet(wb, 'أحمد')
+    row = add_sessions(ws, 3, datetime(2024, 8, 24), ['حاضر', 'غائب', 'حاضر', None, 'حاضر'])
+    add_exam_block(ws, row + 1, [10, 7.5, 'غ'])
+
+    ws = new_student_sheet(wb, 'محمد')
+    row = add_sessions(ws, 3, datetime(2024, 12, 14), ['حاضر', 'حاضر', 'غائب', 'حاضر'], as_text=True)
+    add_exam_block(ws, row, [8, 9, 6])
+
+    ws = new_student_sheet(wb, 'بدون امتحان')
+    add_sessions(ws, 3, datetime(2024, 9, 7), ['حاضر', 'حاضر'])
+
+    wb.save(path)
+
+
+def build_sessions_after_exam(path):
+    """Exam block above or between session rows."""
+    wb = Workbook()
+    wb.remove(wb.active)
+
+    ws = new_student_sheet(wb, 'علي')
+    row = add_sessions(ws, 3, datetime(2024, 9, 7), ['حاضر', 'غائب', 'حاضر'])
+    row = add_exam_block(ws, row + 1, [5, 6, 7])
+    add_sessions(ws, row + 1, datetime(2024, 10, 5), ['حاضر'])
+
+    ws = new_student_sheet(wb, 'عمر')
+    row = add_exam_block(ws, 3, [9, 'غ', 4.5])
+    add_sessions(ws, row, datetime(2024, 11, 2), ['غائب', 'حاضر', 'حاضر'])
+
+    wb.save(path)
+
+
+def build_placeholder_scores(path):
+    """Text placeholders and error cells, which read_excel reads as missing."""
+    wb = Workbook()
+    wb.remove(wb.active)
+
+    ws = new_student_sheet(wb, 'سالم')
+    row = add_sessions(ws, 3, datetime(2024, 9, 7), ['حاضر', 'NA', 'حاضر'])
+    add_exam_block(ws, row, [8, 'غ', 'NA'])
+
+    ws = new_student_sheet(wb, 'خالد')
+    row = add_sessions(ws, 3, datetime(2024, 10, 5), ['حاضر', 'حاضر'])
+    # openpyxl stores a known error code such as '#DIV/0!' as an error cell
+    add_exam_block(ws, row, [7, 6, '#DIV/0!'])
+
+    ws = new_student_sheet(wb, 'يوسف')
+    row = add_sessions(ws, 3, datetime(2024, 11, 2), ['غائب', 'N/A'])
+    ws.cell(row, 1, 'NA')
+    add_exam_block(ws, row + 1, ['n/a', 9, 4])
+
+    wb.save(path)
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    build_sessions_before_exam(os.path.join(here, 'sessions_before_exam.xlsx'))
+    build_sessions_after_exam(os.path.join(here, 'sessions_after_exam.xlsx'))
+    build_placeholder_scores(os.path.join(here, 'placeholder_scores.xlsx'))
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from date_parser import DateParser
+from excel_processor import find_date_row
+
+
+def test_result_does_not_depend_on_earlier_columns():
+    fresh = DateParser()
+    expected = fresh.parse('05/10/2024', fresh.column())
+
+    parser = DateParser()
+    # A day-first column seen first must not change how later strings are read
+    column = parser.column()
+    parser.parse('13/10/2024', column)
+    parser.parse('05/10/2024', column)
+
+    assert parser.parse('05/10/2024', parser.column()) == expected
+
+
+def test_iso_column_uses_format_shortcut():
+    parser = DateParser()
+    column = parser.column()
+    parser.parse('2024-09-07', column)
+    assert parser.parse('2024-09-14', column) == datetime(2024, 9, 14)
+    assert parser.cache_info()['format_hits'] == 1
+
+
+def test_dd_mm_yy_fallback():
+    parser = DateParser()
+    assert parser.parse('25-09-24') == datetime(2024, 9, 25)
+    assert parser.parse('not a date') is None
+
+
+def test_find_date_row_is_order_independent():
+    header = 'التاريخ: السبت'
+    # pandas reads '06/11/2024' month-first, as the baseline did
+    find_date_row([header, '13/11/2024', '06/11/2024'], 1, datetime(2024, 11, 6))
+    assert find_date_row([header, '06/11/2024'], 1, datetime(2024, 6, 11)) == 2
@@ -0,0 +1,74 @@
+import io
+import textwrap
+
+from encoder_decoder import decode_many, encode_data, split_reports
+
+
+def report(data, class_name='الفوج الأول', date='السبت، 1 فبراير 2025 م'):
+    return f"فصل: {class_name}\nالتاريخ: {date}\n---\n{encode_data(data)}\n"
+
+
+def test_reports_with_and_without_blank_lines():
+    paste = report({'n': 1}) + report({'n': 2}) + '\n\n' + report({'n': 3})
+
+    results = decode_many(paste)
+
+    assert [result['data'] for result in results] == [{'n': 1}, {'n': 2}, {'n': 3}]
+    assert all(result['error'] is None for result in results)
+    assert results[0]['header'] == {'class_name': 'الفوج الأول', 'date': 'السبت، 1 فبراير 2025 م'}
+
+
+def test_bare_payloads_separated_by_blank_lines():
+    paste = f"{encode_data({'n': 1})}\n\n{encode_data({'n': 2})}\n"
+
+    assert [result['data'] for result in decode_many(paste)] == [{'n': 1}, {'n': 2}]
+
+
+def test_wrapped_payloads_decode():
+    # Cover every payload length modulo 4
+    for size in range(40, 44):
+        data = {'k': 'v' * size}
+        wrapped = '\n'.join(textwrap.wrap(encode_data(data), 20))
+        results = decode_many('فصل: أ\n---\n' + wrapped)
+
+        assert len(results) == 1
+        assert results[0]['error'] is None
+        assert results[0]['data'] == data
+
+
+def test_header_with_empty_value_starts_a_report():
+    paste = report({'n': 1}) + f"فصل: \nاختبار: نهائي\n---\n{encode_data({'n': 2})}\n"
+
+    reports = list(split_reports(paste))
+    results = decode_many(paste)
+
+    assert len(reports) == 2
+    assert reports[1].startswith('فصل:\nاختبار: نهائي\n---')
+    assert [result['data'] for result in results] == [{'n': 1}, {'n': 2}]
+
+
+def test_corrupt_report_reports_its_own_error():
+    paste = report({'n': 1}) + 'فصل: ب\n---\n!!!not-a-payload\n' + report({'n': 3})
+
+    results = decode_many(paste, max_workers=3)
+
+    assert [result['data'] for result in results] == [{'n': 1}, None, {'n': 3}]
+    assert results[0]['error'] is None
+    assert results[1]['error']
+    assert results[1]['header']['class_name'] == 'ب'
+    assert results[2]['error'] is None
+
+
+def test_results_keep_input_order():
+    paste = ''.join(report({'n': n}, class_name=str(n)) for n in range(20))
+
+    results = decode_many(paste, max_workers=8)
+
+    assert [result['header']['class_name'] for result in results] == [str(n) for n in range(20)]
+    assert [result['data'] for result in results] == [{'n': n} for n in range(20)]
+
+
+def test_file_object_input():
+    source = io.StringIO(report({'n': 1}) + '\n' + report({'n': 2}))
+
+    assert [result['data'] for result in decode_many(source)] == [{'n': 1}, {'n': 2}]
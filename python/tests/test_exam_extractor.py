@@ -0,0 +1,32 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from exam_extractor import extract_exam_scores
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+WORKBOOKS = sorted(glob.glob(os.path.join(FIXTURES, '*.xlsx')))
+
+
+def test_fixture_corpus_exists():
+    assert WORKBOOKS
+
+
+@pytest.mark.parametrize('path', WORKBOOKS, ids=os.path.basename)
+def test_fast_path_matches_pandas(path):
+    expected = extract_exam_scores(path)
+    actual = extract_exam_scores(path, fast=True)
+
+    assert not expected.empty
+    # The XML path keeps whole numbers as int where pandas may widen a column to float
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_sessions_after_exam_block_are_counted():
+    path = os.path.join(FIXTURES, 'sessions_after_exam.xlsx')
+    scores = extract_exam_scores(path, fast=True)
+
+    assert scores.loc['علي', 'Attendance'] == '3/4'
+    assert scores.loc['عمر', 'Attendance'] == '2/3'
@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from openpyxl import Workbook
+
+from excel_processor import ExcelProcessor, HEADER_MARKER, HomeworkData
+
+HEADERS = ['مراجعة بعيدة', 'مراجعة قريبة', 'حفظ']
+TARGET_DATE = datetime(2024, 10, 5)
+
+
+def add_student_sheet(wb, name, first_date):
+    """Header row 2, homework columns repeated from column 6, then four weekly session rows."""
+    ws = wb.create_sheet(name)
+    ws['A1'] = 'بيانات الطالب'
+    ws['A2'] = HEADER_MARKER
+    for col, header in enumerate(HEADERS + HEADERS, start=3):
+        ws.cell(2, col, header)
+    for offset in range(4):
+        ws.cell(3 + offset, 1, first_date + timedelta(days=7 * offset))
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    wb = Workbook()
+    wb.remove(wb.active)
+    add_student_sheet(wb, 'أحمد', datetime(2024, 9, 21))
+    add_student_sheet(wb, 'محمد', datetime(2024, 9, 28))
+    # No session on the target date, so planning this student fails
+    add_student_sheet(wb, 'علي', datetime(2024, 11, 2))
+    path = tmp_path / 'class.xlsx'
+    wb.save(path)
+    return str(path)
+
+
+def homework_data(students):
+    return HomeworkData({
+        'metadata': {'date': {'raw': TARGET_DATE.strftime('%Y-%m-%d')}},
+        'attendance': {name: {'present': name != 'محمد'} for name in students},
+        'homework': {'assignments': [
+            {'type': 'حفظ', 'content': 'سورة الملك', 'assignedStudents': []},
+            {'type': 'مراجعة قريبة', 'content': 'سورة القلم', 'assignedStudents': ['أحمد']},
+        ]},
+        'previousHomework': {'حفظ': {'أحمد': '9', 'محمد': '7.5'}},
+    })
+
+
+def sheet_values(processor):
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)]
+            for ws in processor.formula_wb.worksheets}
+
+
+def test_plan_is_the_same_with_any_executor(workbook_path):
+    data = homework_data(['أحمد', 'محمد', 'علي'])
+    with ExcelProcessor(workbook_path) as processor:
+        serial = processor.plan_workbook(data)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            threaded = processor.plan_workbook(data, executor)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            in_processes = processor.plan_workbook(data, executor)
+
+    assert serial['أحمد']['success']
+    assert threaded == serial
+    assert in_processes == serial
+
+
+def test_plan_writes_expected_cells(workbook_path):
+    with ExcelProcessor(workbook_path) as processor:
+        results = processor.plan_workbook(homework_data(['أحمد']))
+
+    # 2024-10-05 is the third session on this sheet, row 5
+    changes = {(change.row, change.column): change.value for change in results['أحمد']['changes']}
+    assert changes == {
+        (5, 2): 'حاضر',
+        (5, 5): 9.0,
+        (5, 6): '',
+        (5, 7): 'سورة القلم',
+        (5, 8): 'سورة الملك',
+    }
+
+
+def test_dry_run_leaves_workbook_unchanged(workbook_path):
+    with ExcelProcessor(workbook_path) as processor:
+        before = sheet_values(processor)
+        results = processor.process_workbook(homework_data(['أحمد', 'محمد']), dry_run=True)
+        after = sheet_values(processor)
+
+    assert results['أحمد']['changes']
+    assert after == before
+
+
+def test_results_follow_payload_order(workbook_path):
+    students = ['علي', 'غير موجود', 'محمد', 'أحمد']
+    with ExcelProcessor(workbook_path) as processor:
+        results = processor.process_workbook(homework_data(students), dry_run=True)
+
+    assert list(results) == students
+    assert results['غير موجود'] == {
+        'success': False,
+        'error': 'Worksheet not found for student: غير موجود',
+        'changes': []
+    }
+
+
+def test_failed_plan_writes_no_cells(workbook_path):
+    with ExcelProcessor(workbook_path) as processor:
+        before = sheet_values(processor)
+        results = processor.process_workbook(homework_data(['أحمد', 'علي']))
+        after = sheet_values(processor)
+
+    assert results['علي']['success'] is False
+    assert results['علي']['changes'] == []
+    assert after['علي'] == before['علي']
+    assert after['أحمد'] != before['أحمد']
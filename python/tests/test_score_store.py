@@ -0,0 +1,103 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from exam_extractor import process_xlsx_files_in_folder
+from score_store import ScoreStore
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ScoreStore(str(tmp_path / 'scores.db')) as store:
+        yield store
+
+
+def scores_frame():
+    return pd.DataFrame(
+        {'حفظ': [10, 'غ'], 'تجويد': [5.5, 7], 'Attendance': ['5/10', '9/10']},
+        index=['أحمد', 'محمد']
+    )
+
+
+def query_plan(store, query, params):
+    return ' '.join(row[3] for row in store.conn.execute('EXPLAIN QUERY PLAN ' + query, params))
+
+
+def test_repeat_import_changes_nothing(store):
+    assert store.upsert_scores('a.xlsx', scores_frame(), 'fall') == {'changed': 6, 'removed': 0}
+    assert store.upsert_scores('a.xlsx', scores_frame(), 'fall') == {'changed': 0, 'removed': 0}
+
+
+def test_students_below_attendance(store):
+    store.upsert_scores('a.xlsx', scores_frame(), 'fall')
+    rows = store.students_below_attendance(0.7)
+    assert [row['student_sheet'] for row in rows] == ['أحمد']
+
+
+@pytest.mark.parametrize('query, params', [
+    ("SELECT * FROM students WHERE attendance_rate < ?", (0.7,)),
+    ("SELECT * FROM students WHERE attendance_rate < ? AND term = ?", (0.7, 'fall')),
+    ("SELECT * FROM exam_scores WHERE section = ? AND score_value < ?", ('حفظ', 5)),
+    ("SELECT * FROM exam_scores WHERE section = ? AND score_value < ? AND term = ?", ('حفظ', 5, 'fall')),
+])
+def test_threshold_queries_use_an_index(store, query, params):
+    plan = query_plan(store, query, params)
+    assert 'USING INDEX' in plan
+    assert 'SCAN' not in plan
+
+
+def test_term_is_required(store):
+    with pytest.raises(ValueError, match="term is required"):
+        store.upsert_scores('a.xlsx', scores_frame(), None)
+
+
+def test_folder_import_checks_term_before_writing(store, tmp_path):
+    folder = tmp_path / 'class'
+    folder.mkdir()
+    with pytest.raises(ValueError, match="term is required"):
+        process_xlsx_files_in_folder(str(folder), store=store)
+
+
+def test_repeated_section_names_are_kept_apart(store):
+    scores = pd.DataFrame([[8, 9, '4/5']], index=['أحمد'], columns=['حفظ', 'حفظ', 'Attendance'])
+    assert store.upsert_scores('a.xlsx', scores, 'fall') == {'changed': 3, 'removed': 0}
+
+    rows = store.conn.execute("SELECT section, score FROM exam_scores ORDER BY section").fetchall()
+    assert [tuple(row) for row in rows] == [('حفظ', '8'), ('حفظ (2)', '9')]
+
+
+def test_empty_frame_removes_the_files_rows(store):
+    store.upsert_scores('a.xlsx', scores_frame(), 'fall')
+    store.upsert_scores('b.xlsx', scores_frame(), 'fall')
+
+    assert store.upsert_scores('a.xlsx', pd.DataFrame(), 'fall') == {'changed': 0, 'removed': 6}
+    assert {row['class_file'] for row in store.class_attendance_summary()} == {'b.xlsx'}
+
+
+def test_folder_import_removes_rows_of_a_file_without_exam_data(store, tmp_path):
+    folder = tmp_path / 'class'
+    folder.mkdir()
+    shutil.copy(os.path.join(FIXTURES, 'sessions_after_exam.xlsx'), folder / 'class.xlsx')
+    process_xlsx_files_in_folder(str(folder), store=store, term='fall')
+    assert store.class_attendance_summary()
+
+    # The exam block was deleted from the file since the last import
+    Workbook().save(folder / 'class.xlsx')
+    process_xlsx_files_in_folder(str(folder), store=store, term='fall')
+    assert store.class_attendance_summary() == []
+
+
+def test_folders_sharing_a_store_are_keyed_by_relative_path(store, tmp_path):
+    for name in ('friday', 'saturday'):
+        folder = tmp_path / name
+        folder.mkdir()
+        shutil.copy(os.path.join(FIXTURES, 'sessions_after_exam.xlsx'), folder / 'class.xlsx')
+        process_xlsx_files_in_folder(str(folder), store=store, term='fall', root=str(tmp_path))
+
+    classes = [row['class_file'] for row in store.class_attendance_summary()]
+    assert sorted(classes) == ['friday/class.xlsx', 'saturday/class.xlsx']
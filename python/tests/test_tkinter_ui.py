@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from excel_processor import CellChange
+from tkinter_ui import ExcelProcessorApp, preview_position, preview_text
+
+
+class FakeTable:
+    """Stands in for a ttk.Treeview, keeping each item's values in a dict."""
+
+    def __init__(self, rows):
+        self.values = {f'I{idx}': list(row) for idx, row in enumerate(rows)}
+
+    def item(self, item_id, option=None, values=None):
+        if values is not None:
+            self.values[item_id] = list(values)
+        return tuple(self.values[item_id])
+
+
+class FakeApp:
+    """Just the state refresh_changed_cells uses, so no Tk root is needed."""
+
+    def __init__(self, rows, columns):
+        self.table = FakeTable(rows)
+        self.sheet_tables = {'class.xlsx': {'أحمد': {
+            'table': self.table, 'columns': columns, 'items': list(self.table.values)
+        }}}
+        self.reloaded = []
+
+    def reload_sheet(self, filename, sheet_name):
+        self.reloaded.append((filename, sheet_name))
+
+
+def refresh(app, changes):
+    ExcelProcessorApp.refresh_changed_cells(app, 'class.xlsx', changes)
+
+
+@pytest.mark.parametrize('row, column, expected', [
+    (2, 1, (0, 0)),
+    (5, 3, (3, 2)),
+    (6, 4, (4, 3)),
+    (1, 1, None),
+    (7, 1, None),
+    (2, 5, None),
+    (2, 0, None),
+])
+def test_preview_position(row, column, expected):
+    assert preview_position(row, column, row_count=5, column_count=4) == expected
+
+
+def test_cleared_cell_matches_a_reload(tmp_path):
+    wb = Workbook()
+    wb.active.append(['التاريخ', 'الحضور', 'حفظ'])
+    wb.active.append(['2024-10-05', 'حاضر', None])
+    wb.save(tmp_path / 'class.xlsx')
+    reloaded = pd.read_excel(tmp_path / 'class.xlsx')
+
+    assert preview_text('') == preview_text(reloaded.iloc[0, 2]) == 'nan'
+    assert preview_text('حاضر') == preview_text(reloaded.iloc[0, 1])
+    assert preview_text(9.0) == '9.0'
+
+
+def test_refresh_patches_only_changed_cells():
+    app = FakeApp([['a', 'b', 'c'], ['d', 'e', 'f']], ['x', 'y', 'z'])
+    refresh(app, [CellChange('أحمد', 3, 2, 'حاضر'), CellChange('أحمد', 3, 3, '')])
+
+    assert app.table.values == {'I0': ['a', 'b', 'c'], 'I1': ['d', 'حاضر', 'nan']}
+    assert app.reloaded == []
+
+
+def test_refresh_reloads_a_sheet_when_a_change_is_outside_the_table():
+    app = FakeApp([['a', 'b', 'c'], ['d', 'e', 'f']], ['x', 'y', 'z'])
+    refresh(app, [CellChange('أحمد', 3, 2, 'حاضر'), CellChange('أحمد', 9, 2, 'غائب'),
+                  CellChange('غير موجود', 2, 1, 'x')])
+
+    # The reload replaces the whole sheet, so its in-range change is not patched first
+    assert app.table.values['I1'] == ['d', 'e', 'f']
+    assert app.reloaded == [('class.xlsx', 'أحمد')]